@@ -1,19 +1,35 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
 import requests
-from bs4 import BeautifulSoup
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from cachetools import TTLCache, cached
+import orjson
 import re
 import logging
-from typing import List, Dict, Tuple
+import threading
+from collections import defaultdict
+from operator import itemgetter
+import heapq
 import os
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG)
+_LOG_LEVEL_NAME = os.environ.get('LOG_LEVEL', 'INFO').upper()
+_LOG_LEVEL = logging.getLevelName(_LOG_LEVEL_NAME)
+# getLevelName returns a placeholder string, not a number, for unknown names
+_LOG_LEVEL_VALID = isinstance(_LOG_LEVEL, int)
+logging.basicConfig(level=_LOG_LEVEL if _LOG_LEVEL_VALID else logging.INFO)
 logger = logging.getLogger(__name__)
+if not _LOG_LEVEL_VALID:
+    logger.warning("Unknown LOG_LEVEL %r, falling back to INFO", _LOG_LEVEL_NAME)
 
 app = Flask(__name__)
 
+def _json(obj):
+    """Serialize obj with orjson into an application/json response."""
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
 # Simple CORS configuration
 CORS(app, 
      resources={
@@ -21,15 +37,23 @@ CORS(app,
              "origins": ["https://shl-assessment-nine.vercel.app"],
              "methods": ["GET", "POST", "OPTIONS"],
              "allow_headers": ["Content-Type"],
-             "supports_credentials": False
+             "supports_credentials": False,
+             "max_age": 3600
          }
      })
 
+# Answer preflight requests for known routes before view dispatch;
+# flask-cors adds the CORS headers to the empty response
+@app.before_request
+def _short_options():
+    if request.method == 'OPTIONS' and request.url_rule is not None:
+        return Response(status=204)
+
 # Error handler for all exceptions
 @app.errorhandler(Exception)
 def handle_error(error):
     logger.error(f"An error occurred: {str(error)}")
-    return jsonify({
+    return _json({
         "error": "An internal server error occurred. Please try again."
     }), 500
 
@@ -136,43 +160,138 @@ SHL_TESTS = [
     }
 ]
 
+# Translation table deleting every ASCII character that is not a letter, digit or whitespace
+_CLEAN_TABLE = str.maketrans('', '', ''.join(
+    chr(i) for i in range(128)
+    if not chr(i).isalnum() and not chr(i).isspace()
+))
+
+# Fallback for non-ASCII text; \s stays unicode-aware so e.g. non-breaking spaces still split words
+_CLEAN_RE = re.compile(r'[^a-zA-Z0-9\s]')
+
 def clean_text(text):
     # Remove special characters and convert to lowercase
-    return re.sub(r'[^a-zA-Z0-9\s]', '', text.lower())
+    if text.isascii():
+        return text.lower().translate(_CLEAN_TABLE)
+    # Non-ASCII input still goes through the regex so unicode characters are dropped
+    return _CLEAN_RE.sub('', text.lower())
+
+# Shared HTTP session so connections and TLS handshakes are reused across URL fetches
+_HTTP = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=20,
+                            max_retries=Retry(total=2, backoff_factor=0.2))
+_HTTP.mount('http://', _HTTP_ADAPTER)
+_HTTP.mount('https://', _HTTP_ADAPTER)
+
+# Extracted page text keyed by URL, so repeated job description URLs skip the fetch and parse.
+# Bounded by total text length (about 32 MB per worker), not by entry count.
+_URL_CACHE = TTLCache(maxsize=32 << 20, ttl=3600, getsizeof=len)
+
+# Upper bound on how much of a page is read and parsed
+_MAX_PAGE_BYTES = 1 << 20
+
+# Paragraphs, headings and list items are the only tags we extract text from
+_TEXT_TAGS = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li']
+_TEXT_STRAINER = SoupStrainer(_TEXT_TAGS)
+
+@cached(_URL_CACHE, lock=threading.Lock())
+def _fetch_page_text(url):
+    # (connect, read) timeouts
+    with _HTTP.get(url, stream=True, timeout=(3.05, 10)) as response:
+        # Error pages raise here so they are never parsed or cached
+        response.raise_for_status()
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= _MAX_PAGE_BYTES:
+                logger.warning("Page %s exceeds %d bytes, parsing only the start", url, _MAX_PAGE_BYTES)
+                break
+    content = b''.join(chunks)[:_MAX_PAGE_BYTES]
+    # Only build nodes for the tags we read text from
+    soup = BeautifulSoup(content, 'lxml', parse_only=_TEXT_STRAINER)
+    # Get text from paragraphs, headings, and list items
+    text_elements = soup.select('p, h1, h2, h3, h4, h5, h6, li')
+    return ' '.join(elem.get_text(' ', strip=True) for elem in text_elements)
 
 def extract_text_from_url(url):
     try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        # Get text from paragraphs, headings, and list items
-        text_elements = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
-        return ' '.join([elem.text.strip() for elem in text_elements])
+        # Failures raise out of the cached function, so they are never cached
+        return _fetch_page_text(url)
     except Exception as e:
         logger.error(f"Error extracting text from URL: {str(e)}")
         return None
 
-def calculate_relevance_score(query_terms: List[str], test: Dict) -> float:
-    """Calculate relevance score using keyword and description matching."""
+# Pre-cleaned token sets per test, built once at import
+_TEST_CLEANED = [
+    {
+        "keywords": [clean_text(keyword) for keyword in test['keywords']],
+        "keyword_set": frozenset(clean_text(keyword) for keyword in test['keywords']),
+        "text_tokens": frozenset(clean_text(test['description'] + ' ' + ' '.join(test['keywords']) + ' ' + test['name']).split()),
+        "name_tokens": frozenset(clean_text(test['name']).split())
+    }
+    for test in SHL_TESTS
+]
+
+def _substrings(tokens):
+    """Return every non-empty substring of the given tokens."""
+    return {token[start:end]
+            for token in tokens
+            for start in range(len(token))
+            for end in range(start + 1, len(token) + 1)}
+
+# Sparse term x test postings, the rows of the catalog's token matrix:
+# keyword -> tests having it as a keyword, and substring -> tests whose full
+# text or name contain it. A query term has no whitespace, so it occurs in a
+# test's text exactly when it is a substring of one of its tokens.
+_KEYWORD_POSTINGS = defaultdict(list)
+_INVERTED = defaultdict(list)
+_NAME_POSTINGS = defaultdict(list)
+for _idx, _cleaned in enumerate(_TEST_CLEANED):
+    for _token in _cleaned['keyword_set']:
+        _KEYWORD_POSTINGS[_token].append(_idx)
+    for _token in _substrings(_cleaned['text_tokens']):
+        _INVERTED[_token].append(_idx)
+    for _token in _substrings(_cleaned['name_tokens']):
+        _NAME_POSTINGS[_token].append(_idx)
+
+# Keyword match component per test, indexed by the number of matched keywords
+_KEYWORD_SCORES = [
+    tuple((matches / len(cleaned['keywords'])) * 0.5 for matches in range(len(cleaned['keywords']) + 1))
+    for cleaned in _TEST_CLEANED
+]
+
+# Prefix trie over cleaned keywords; every node maps None -> indices of tests with a keyword below it
+_KEYWORD_TRIE = {None: set()}
+for _idx, _cleaned in enumerate(_TEST_CLEANED):
+    for _keyword in _cleaned['keywords']:
+        _node = _KEYWORD_TRIE
+        for _char in _keyword:
+            _node = _node.setdefault(_char, {None: set()})
+            _node[None].add(_idx)
+
+def _trie_prefix_hits(term, trie=_KEYWORD_TRIE):
+    """Return indices of tests having a keyword that starts with term."""
+    node = trie
+    for char in term:
+        node = node.get(char)
+        if node is None:
+            return set()
+    return node[None]
+
+def calculate_relevance_score(idx: int, keyword_matches: int, term_matches: float, name_match: bool, n_terms: int) -> float:
+    """Combine a test's match counts into its weighted relevance score."""
     score = 0.0
-    test_text = clean_text(test['description'] + ' ' + ' '.join(test['keywords']) + ' ' + test['name'])
     
     # Exact keyword matches (50% weight)
-    keyword_matches = sum(clean_text(keyword) in query_terms for keyword in test['keywords'])
-    score += (keyword_matches / len(test['keywords'])) * 0.5
+    score += _KEYWORD_SCORES[idx][keyword_matches]
     
     # Partial matches in query terms (30% weight)
-    term_matches = 0
-    for term in query_terms:
-        if len(term) > 3:
-            if term in test_text:
-                term_matches += 1
-            # Check for word stems
-            if any(keyword for keyword in test['keywords'] if keyword.startswith(term)):
-                term_matches += 0.5
-    score += (term_matches / len(query_terms)) * 0.3
+    score += (term_matches / n_terms) * 0.3
     
     # Name match bonus (20% weight)
-    if any(term in clean_text(test['name']) for term in query_terms):
+    if name_match:
         score += 0.2
     
     return score
@@ -180,78 +299,98 @@ def calculate_relevance_score(query_terms: List[str], test: Dict) -> float:
 def find_relevant_tests(query, max_results=10):
     query = clean_text(query)
     query_terms = query.split()
+    query_set = frozenset(query_terms)
     relevant_tests = []
     
-    for test in SHL_TESTS:
-        score = calculate_relevance_score(query_terms, test)
+    # Accumulate per-test match counts from the postings of each query term,
+    # so only tests containing a query term or keyword stem are touched
+    keyword_matches = defaultdict(int)
+    for term in query_set:
+        for idx in _KEYWORD_POSTINGS.get(term, ()):
+            keyword_matches[idx] += 1
+    
+    term_matches = defaultdict(float)
+    for term in query_terms:
+        if len(term) > 3:
+            for idx in _INVERTED.get(term, ()):
+                term_matches[idx] += 1
+            # Check for word stems
+            for idx in _trie_prefix_hits(term):
+                term_matches[idx] += 0.5
+    
+    name_matches = set().union(*(_NAME_POSTINGS.get(term, ()) for term in query_set))
+    
+    candidates = keyword_matches.keys() | term_matches.keys() | name_matches
+    for idx in sorted(candidates):
+        score = calculate_relevance_score(idx, keyword_matches[idx], term_matches[idx],
+                                          idx in name_matches, len(query_terms))
         
         if score > 0:
-            test_copy = test.copy()
-            test_copy['relevance_score'] = float(score)
-            relevant_tests.append(test_copy)
+            relevant_tests.append((score, idx))
     
-    # Sort by relevance score
-    relevant_tests.sort(key=lambda x: x['relevance_score'], reverse=True)
-    recommended = relevant_tests[:max_results]
+    # Take the best scores (ties keep catalog order) and only build dicts for those
+    top = heapq.nlargest(max_results, relevant_tests, key=itemgetter(0))
+    recommended = [dict(SHL_TESTS[idx], relevance_score=float(score)) for score, idx in top]
     
     return {
         'recommendations': recommended,
         'message': f'Found {len(recommended)} relevant tests.'
     }
 
+# Constant bodies for the status endpoints, serialized once at import
+_HOME_JSON = orjson.dumps({
+    'status': 'ok',
+    'message': 'SHL Test Recommender API is running'
+})
+_HEALTH_JSON = orjson.dumps({'status': 'healthy'})
+
 @app.route('/', methods=['GET', 'OPTIONS'])
 def home():
-    return jsonify({
-        'status': 'ok',
-        'message': 'SHL Test Recommender API is running'
-    })
+    return Response(_HOME_JSON, mimetype='application/json')
+
+@app.route('/health', methods=['GET'])
+def health():
+    return Response(_HEALTH_JSON, mimetype='application/json')
 
 @app.route('/recommend', methods=['POST', 'OPTIONS'])
+@app.route('/api/recommend', methods=['POST', 'OPTIONS'])
 def recommend_tests():
-    # Handle preflight requests
-    if request.method == 'OPTIONS':
-        response = jsonify({'status': 'ok'})
-        response.headers['Access-Control-Allow-Origin'] = 'https://shl-assessment-nine.vercel.app'
-        response.headers['Access-Control-Allow-Methods'] = 'POST, OPTIONS'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
-        return response, 200
-        
     try:
-        logger.debug(f"Received request: {request.data}")
+        logger.debug("Received request of %d bytes", request.content_length or 0)
         data = request.json
         
         if not data:
-            return jsonify({'error': 'No data provided'}), 400
+            return _json({'error': 'No data provided'}), 400
             
         query = data.get('query', '').strip()
         url = data.get('url', '').strip()
         
         if not query and not url:
-            return jsonify({'error': 'Please provide either a query or URL'}), 400
+            return _json({'error': 'Please provide either a query or URL'}), 400
         
         if url:
             text = extract_text_from_url(url)
             if text:
                 query = text
             else:
-                return jsonify({'error': 'Could not extract text from URL'}), 400
+                return _json({'error': 'Could not extract text from URL'}), 400
         
         results = find_relevant_tests(query)
         
         if not results['recommendations']:
-            return jsonify({
+            return _json({
                 'recommendations': [],
                 'message': 'No matching tests found. Try different search terms.'
             })
         else:
-            return jsonify({
+            return _json({
                 'recommendations': results['recommendations'],
                 'message': f'Found {len(results["recommendations"])} relevant tests.'
             })
             
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}")
-        return jsonify({'error': 'An error occurred while processing your request'}), 500
+        return _json({'error': 'An error occurred while processing your request'}), 500
 
 if __name__ == '__main__':
     logger.info("Starting SHL Test Recommender API...")